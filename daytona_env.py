@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import functools
+import importlib
+import importlib.util
+import subprocess
+
+DAYTONA_API_URL = 'https://api.daytona.io'
+DAYTONA_TARGET = 'us'
+
+@functools.lru_cache(maxsize=8)
+def get_daytona(api_key):
+    """Return a shared SDK client for api_key, configured once per key"""
+    if not api_key:
+        raise RuntimeError('DAYTONA_API_KEY environment variable is required')
+
+    # Install the Daytona SDK if it's missing. This is a full pip install whenever it
+    # runs; find_spec only skips it once the SDK is importable
+    if importlib.util.find_spec('daytona_sdk') is None:
+        subprocess.run([sys.executable, '-m', 'pip', 'install', '--prefer-binary', '--no-input',
+                        '--disable-pip-version-check', 'daytona-sdk'], check=True)
+        # Let the import system see the freshly installed package
+        importlib.invalidate_caches()
+
+    # Imported here so callers that never need a client don't pay for loading the SDK
+    from daytona_sdk import Daytona, DaytonaConfig
+    return Daytona(DaytonaConfig(
+        api_key=api_key,
+        api_url=os.getenv('DAYTONA_API_URL', DAYTONA_API_URL),
+        target=os.getenv('DAYTONA_TARGET', DAYTONA_TARGET),
+    ))
@@ -2,43 +2,93 @@
 
 import os
 import sys
+import json
+import time
+import argparse
+from daytona_env import get_daytona
 
-# Set environment variables for Daytona SDK
-os.environ['DAYTONA_API_KEY'] = 'dtn_48917f47a7ccd44c830b8a291e336938309a328b1748c77a3fdde9872bf0b45b'
-os.environ['DAYTONA_API_URL'] = 'https://api.daytona.io'
-os.environ['DAYTONA_TARGET'] = 'us'
+# Preview URL and token are stable for the life of a sandbox, so cache them locally
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'daytona')
+CACHE_TTL_SECONDS = 60 * 60
 
-from daytona_sdk import Daytona
+def cache_path(sandbox_id):
+    return os.path.join(CACHE_DIR, f'preview-{sandbox_id}.json')
+
+def load_cached_preview(sandbox_id):
+    """Return the cached preview info if it is younger than the TTL"""
+    path = cache_path(sandbox_id)
+    try:
+        if time.time() - os.path.getmtime(path) >= CACHE_TTL_SECONDS:
+            return None
+        with open(path) as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+def save_cached_preview(sandbox_id, preview):
+    """Atomically write the preview info, readable only by the current user since it holds the auth token"""
+    os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+    os.chmod(CACHE_DIR, 0o700)
+    path = cache_path(sandbox_id)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(preview, cache_file)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def fetch_preview(sandbox_id):
+    """Look up the port 3000 preview link through the Daytona SDK"""
+    # Initialize Daytona SDK (loaded lazily, so cache hits never import it)
+    daytona = get_daytona(os.getenv('DAYTONA_API_KEY'))
+    
+    # Get the sandbox
+    print('📡 Connecting to sandbox...')
+    sandbox = daytona.find_one(sandbox_id)
+    
+    # Get preview link for port 3000
+    print('🌐 Getting preview URL for port 3000...')
+    preview_info = sandbox.get_preview_link(3000)
+    
+    return {'url': preview_info.url, 'token': preview_info.token}
 
 def main():
-    sandbox_id = 'f9b8c0fa-0649-428e-9042-d774e1123721'
+    parser = argparse.ArgumentParser(description='Get the preview URL for a Daytona sandbox')
+    parser.add_argument('sandbox_id', nargs='?', default='f9b8c0fa-0649-428e-9042-d774e1123721')
+    parser.add_argument('--refresh', action='store_true', help='ignore the cached preview link')
+    args = parser.parse_args()
+    sandbox_id = args.sandbox_id
     
     try:
         print(f'🔍 Getting preview info for sandbox: {sandbox_id}')
         
-        # Initialize Daytona SDK
-        daytona = Daytona()
-        
-        # Get the sandbox
-        print('📡 Connecting to sandbox...')
-        sandbox = daytona.find_one(sandbox_id)
-        
-        # Get preview link for port 3000
-        print('🌐 Getting preview URL for port 3000...')
-        preview_info = sandbox.get_preview_link(3000)
+        preview = None if args.refresh else load_cached_preview(sandbox_id)
+        if preview is not None:
+            print('⚡ Using cached preview link')
+        else:
+            preview = fetch_preview(sandbox_id)
+            try:
+                save_cached_preview(sandbox_id, preview)
+            except OSError as cache_error:
+                # The preview was fetched fine; failing to cache it shouldn't fail the run
+                print(f'⚠️ Could not cache preview link: {str(cache_error)}')
         
-        print(f"Preview link url: {preview_info.url}")
-        print(f"Preview link token: {preview_info.token}")
+        print(f"Preview link url: {preview['url']}")
+        print(f"Preview link token: {preview['token']}")
         
         print('\n🎉 SUCCESS! Your scaffold application is ready!')
         print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
-        print(f'🔗 Preview URL: {preview_info.url}')
-        print(f'🔑 Auth Token: {preview_info.token}')
+        print(f"🔗 Preview URL: {preview['url']}")
+        print(f"🔑 Auth Token: {preview['token']}")
         print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
         
         print(f'\n📋 Access Methods:')
-        print(f'🌐 Browser: {preview_info.url}')
-        print(f'💻 cURL: curl -H "x-daytona-preview-token: {preview_info.token}" {preview_info.url}')
+        print(f"🌐 Browser: {preview['url']}")
+        print(f"💻 cURL: curl -H \"x-daytona-preview-token: {preview['token']}\" {preview['url']}")
         
     except Exception as error:
         print(f'❌ Error: {str(error)}')
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import codecs
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# In-sandbox log the setup script tees its output to, so the host can stream it
+SETUP_LOG_PATH = '/tmp/setup.log'
+
+# Dev server PID (and process group) inside the sandbox, used when recycling it
+DEV_SERVER_PID_PATH = '/tmp/dev.pid'
+
+@functools.lru_cache(maxsize=1)
+def _preview_http():
+    """Keep-alive pool shared by every preview readiness probe in this process"""
+    # urllib3 arrives with the Daytona SDK, so it is only imported once
+    # daytona_env.get_daytona has had the chance to install it
+    import urllib3
+    
+    # Disable SSL warnings for self-signed certificates
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    return urllib3.PoolManager(cert_reqs='CERT_NONE', maxsize=16)
+
+def publish_preview(sandbox):
+    """Fetch the port 3000 preview link, wait for it to respond and print access details"""
+    print('\n🌐 Getting preview URL for port 3000...')
+    preview_info = sandbox.get_preview_link(3000)
+    
+    print(f"Preview link url: {preview_info.url}")
+    print(f"Preview link token: {preview_info.token}")
+    
+    print('⏳ Waiting for preview URL to respond...')
+    ready = wait_for_preview(preview_info)
+    
+    if ready:
+        print('\n🎉 SUCCESS! Your scaffold application is ready!')
+    else:
+        print('\n⏳ Sandbox is set up, but the scaffold application is not responding yet - retry the preview URL shortly')
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    print(f'🔗 Preview URL: {preview_info.url}')
+    print(f'🔑 Auth Token: {preview_info.token}')
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    
+    print(f'\n📋 Access Methods:')
+    print(f'🌐 Browser: {preview_info.url}')
+    print(f'💻 cURL: curl -H "x-daytona-preview-token: {preview_info.token}" {preview_info.url}')
+    
+    return {
+        'sandbox_id': sandbox.id,
+        'url': preview_info.url,
+        'token': preview_info.token,
+        'ready': ready
+    }
+
+def wait_for_preview(preview_info, timeout=60):
+    """Poll the preview URL with exponential backoff until the dev server responds"""
+    import urllib3
+    
+    http = _preview_http()
+    headers = {'x-daytona-preview-token': preview_info.token}
+    deadline = time.monotonic() + timeout
+    delay = 0.25
+    
+    while True:
+        try:
+            response = http.request('GET', preview_info.url, headers=headers,
+                                    timeout=2, retries=False)
+            if response.status < 500:
+                print(f'✅ Preview URL responded with status {response.status}')
+                return True
+        except urllib3.exceptions.HTTPError:
+            pass
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f'⚠️ Preview URL not ready after {timeout}s - the dev server may still be starting')
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 5)
+
+def build_setup_code():
+    """Build the in-sandbox script that clones the repository, installs dependencies and starts the dev server"""
+    
+    # Optional object-storage prefix holding node_modules-<key>.tar.zst tarballs.
+    # Uploading back to it is a separate opt-in that requires a bearer token, so the
+    # cache is never populated through an unauthenticated, publicly writable prefix.
+    cache_url = os.getenv('SCAFFOLD_NODE_MODULES_CACHE_URL', '')
+    upload_token = os.getenv('SCAFFOLD_NODE_MODULES_CACHE_UPLOAD_TOKEN', '')
+    
+    # Clone, install and dev server launch run as a single script so the sandbox
+    # only pays for one API round-trip and one interpreter startup
+    return (f"NODE_MODULES_CACHE_URL = {cache_url!r}\n"
+            f"NODE_MODULES_CACHE_UPLOAD_TOKEN = {upload_token!r}\n"
+            f"SETUP_LOG_PATH = {SETUP_LOG_PATH!r}\n"
+            f"DEV_SERVER_PID_PATH = {DEV_SERVER_PID_PATH!r}\n") + '''
+import subprocess
+import os
+import sys
+import shutil
+import hashlib
+import platform
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class Tee:
+    """Mirror everything printed into the setup log so the host can stream it while we run"""
+    def __init__(self, *streams):
+        self.streams = streams
+    def write(self, data):
+        for stream in self.streams:
+            stream.write(data)
+            stream.flush()
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+# Tee stderr too: failure messages from sys.exit() and tracebacks are written there
+setup_log = open(SETUP_LOG_PATH, 'w', buffering=1)
+sys.stdout = Tee(sys.stdout, setup_log)
+sys.stderr = Tee(sys.stderr, setup_log)
+
+CLONE_ARGS = ['git', 'clone', '--depth', '1', '--filter=blob:none', '--single-branch', 
+              '--branch', 'main', '--no-tags', 'https://github.com/pria-cloud/agents.git']
+
+def clone_repository():
+    """Clone only scaffold-files (shallow, partial and sparse - the sandbox only needs that working tree)"""
+    result = subprocess.run(CLONE_ARGS[:2] + ['--sparse'] + CLONE_ARGS[2:], 
+                            cwd='/home/daytona', capture_output=True, text=True)
+    if result.returncode == 0:
+        result = subprocess.run(['git', 'sparse-checkout', 'set', 'scaffold-files'], 
+                                cwd='/home/daytona/agents', capture_output=True, text=True)
+        if result.returncode == 0:
+            return result
+    
+    # Sparse checkout isn't viable (e.g. git < 2.25); fall back to a plain partial clone
+    print(f"Sparse checkout failed, falling back to partial clone: {result.stderr}")
+    shutil.rmtree('/home/daytona/agents', ignore_errors=True)
+    return subprocess.run(CLONE_ARGS, cwd='/home/daytona', capture_output=True, text=True)
+
+# Point every npm child at a local cache via the environment rather than
+# spawning a separate `npm config set` process
+os.environ['npm_config_cache'] = '/tmp/npmcache'
+
+def warm_npm_cache():
+    """Verify the npm cache while the clone is in flight"""
+    return subprocess.run(['npm', 'cache', 'verify'], capture_output=True, text=True)
+
+# Clone the repository and warm the npm cache in parallel
+print("Cloning repository...")
+with ThreadPoolExecutor(max_workers=2) as executor:
+    clone_future = executor.submit(clone_repository)
+    cache_future = executor.submit(warm_npm_cache)
+    result = clone_future.result()
+    cache_result = cache_future.result()
+print(f"Clone exit code: {result.returncode}")
+print(f"Clone output: {result.stdout}")
+if result.stderr:
+    print(f"Clone errors: {result.stderr}")
+print(f"npm cache verify exit code: {cache_result.returncode}")
+if result.returncode != 0:
+    sys.exit("Clone failed")
+
+# Change to the scaffold-files directory
+os.chdir('/home/daytona/agents/scaffold-files')
+print(f"Changed to agents/scaffold-files directory")
+print(f"Current directory: {os.getcwd()}")
+print(f"Files here: {os.listdir('.')}")
+
+# Try to restore a cached node_modules keyed by lockfile hash + node version + platform
+cache_tarball = None
+restored = False
+if NODE_MODULES_CACHE_URL and os.path.exists('package-lock.json'):
+    with open('package-lock.json', 'rb') as lockfile:
+        lock_hash = hashlib.sha256(lockfile.read()).hexdigest()
+    node_version = subprocess.run(['node', '--version'], capture_output=True, text=True).stdout.strip()
+    cache_key = hashlib.sha256(f"{lock_hash}-{node_version}-{platform.system()}-{platform.machine()}".encode()).hexdigest()[:16]
+    cache_tarball = f"node_modules-{cache_key}.tar.zst"
+    cache_object_url = f"{NODE_MODULES_CACHE_URL.rstrip('/')}/{cache_tarball}"
+    
+    print(f"Looking up node_modules cache: {cache_tarball}")
+    fetch = subprocess.run(['curl', '-fsSL', '-o', cache_tarball, cache_object_url], 
+                           capture_output=True, text=True)
+    if fetch.returncode == 0:
+        extract = subprocess.run(['tar', '-I', 'zstd', '-xf', cache_tarball], 
+                                 capture_output=True, text=True)
+        restored = extract.returncode == 0
+        if not restored:
+            print(f"Cache extract failed: {extract.stderr}")
+        os.remove(cache_tarball)
+    print(f"Cache {'hit' if restored else 'miss'}")
+
+if not restored:
+    # Install dependencies with legacy peer deps to handle React version conflicts.
+    # Prefer `npm ci` against the committed (already deduped) lockfile; fall back to
+    # `npm install --prefer-dedupe` if it's missing so the resolved tree stays flat.
+    if os.path.exists('package-lock.json'):
+        npm_args = ['npm', 'ci']
+    else:
+        npm_args = ['npm', 'install', '--prefer-dedupe']
+    print(f"Running {' '.join(npm_args)}...")
+    # Stream the install log line by line instead of buffering all of it in memory
+    install = subprocess.Popen(npm_args + ['--prefer-offline', '--no-audit', '--no-fund', '--legacy-peer-deps'], 
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    for line in install.stdout:
+        print(line, end='')
+    install_exit_code = install.wait()
+    print(f"Exit code: {install_exit_code}")
+    if install_exit_code != 0:
+        sys.exit("Dependency install failed")
+
+# Start dev server detached, logging to a file so a full pipe can never block it
+print("Starting npm run dev in background...")
+process = subprocess.Popen(['npm', 'run', 'dev'], 
+                          stdout=open('/tmp/dev.log', 'a'), 
+                          stderr=subprocess.STDOUT, 
+                          stdin=subprocess.DEVNULL, 
+                          start_new_session=True)
+print(f"Development server started with PID: {process.pid}")
+
+# Record the dev server's process group so a recycled sandbox can restart it
+with open(DEV_SERVER_PID_PATH, 'w') as pid_file:
+    pid_file.write(str(process.pid))
+
+# Populate the cache after a successful cold install. Packing and uploading run
+# detached at low priority so they stay off the dev server's critical path. The dev
+# server writes into node_modules/.cache meanwhile, so that is excluded, and tar's
+# exit code 1 ("file changed as we read it") still counts as a usable archive.
+if not restored and install_exit_code == 0 and cache_tarball and NODE_MODULES_CACHE_UPLOAD_TOKEN:
+    print(f"Uploading node_modules cache in background: {cache_tarball}")
+    subprocess.Popen(['nice', '-n', '10', 'sh', '-c', 
+                      'tar --exclude=node_modules/.cache -I zstd -cf "$1" node_modules; status=$?; '
+                      'if [ "$status" -le 1 ]; then '
+                      'curl -fsS -H "Authorization: Bearer $CACHE_UPLOAD_TOKEN" -T "$1" "$2"; '
+                      'else echo "Cache pack failed with tar exit code $status"; fi; '
+                      'rm -f "$1"', 
+                      'cache-upload', cache_tarball, cache_object_url], 
+                     env={**os.environ, 'CACHE_UPLOAD_TOKEN': NODE_MODULES_CACHE_UPLOAD_TOKEN}, 
+                     stdout=open('/tmp/cache-upload.log', 'a'), 
+                     stderr=subprocess.STDOUT, 
+                     stdin=subprocess.DEVNULL, 
+                     start_new_session=True)
+
+# Wait for the dev server to accept connections on port 3000
+deadline = time.monotonic() + 60
+ready = False
+while time.monotonic() < deadline and process.poll() is None:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.settimeout(0.5)
+        if probe.connect_ex(('127.0.0.1', 3000)) == 0:
+            ready = True
+            break
+    time.sleep(0.5)
+
+if ready:
+    print("✅ Development server is listening on port 3000")
+elif process.poll() is not None:
+    sys.exit(f"Development server exited with code {process.returncode} - see /tmp/dev.log")
+else:
+    print("⏳ Development server not listening yet - it should be available shortly on port 3000")
+'''
+
+def setup_sandbox(sandbox):
+    """Set up the sandbox with repository clone, dependency installation, and dev server"""
+    setup_code = build_setup_code()
+    
+    print('📂 Cloning repository, installing dependencies and starting development server...')
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        run_future = executor.submit(sandbox.process.code_run, setup_code)
+        streamed = stream_sandbox_log(sandbox, SETUP_LOG_PATH, run_future)
+        response = run_future.result()
+    
+    # Nothing reached us through the log (e.g. download_file kept failing), so
+    # fall back to the output code_run collected
+    if not streamed:
+        print(f"📝 Setup output: {response.result}")
+    
+    if response.exit_code != 0:
+        raise RuntimeError(f'Sandbox setup failed (exit code: {response.exit_code})')
+    print(f"✅ Sandbox setup complete")
+
+def stream_sandbox_log(sandbox, path, run_future, interval=2):
+    """Poll a log file inside the sandbox and echo new output until run_future finishes"""
+    # download_file has no range support, so every poll re-downloads the whole log and
+    # total transfer grows quadratically with log length; the interval is kept coarse
+    # to bound that over a multi-minute npm install
+    offset = 0
+    # Decode incrementally so a multi-byte character split across two polls isn't mangled
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        wait([run_future], timeout=interval)
+        finished = run_future.done()
+        try:
+            content = sandbox.fs.download_file(path)
+        except Exception:
+            # The log doesn't exist until the setup script has started
+            content = b''
+        if len(content) > offset:
+            sys.stdout.write(decoder.decode(content[offset:]))
+            sys.stdout.flush()
+            offset = len(content)
+        if finished:
+            sys.stdout.write(decoder.decode(b'', final=True))
+            return offset
@@ -0,0 +1,138 @@
+import itertools
+import threading
+import time
+import types
+import unittest
+
+from warm_pool import WarmSandboxPool
+
+class StubProcess:
+    def __init__(self, exit_code=0, delay=0):
+        self.exit_code = exit_code
+        self.delay = delay
+        self.commands = []
+
+    def exec(self, command, cwd=None):
+        self.commands.append(command)
+        time.sleep(self.delay)
+        return types.SimpleNamespace(exit_code=self.exit_code, result='')
+
+class StubDaytona:
+    """Records create()/delete() calls the way the quota would see them"""
+
+    def __init__(self, recycle_exit_code=0, recycle_delay=0):
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.recycle_exit_code = recycle_exit_code
+        self.recycle_delay = recycle_delay
+        self.created = []
+        self.deleted = []
+
+    def create(self):
+        with self._lock:
+            sandbox = types.SimpleNamespace(
+                id=next(self._ids),
+                process=StubProcess(self.recycle_exit_code, self.recycle_delay),
+            )
+            self.created.append(sandbox.id)
+        return sandbox
+
+    def delete(self, sandbox):
+        with self._lock:
+            self.deleted.append(sandbox.id)
+
+    def alive(self):
+        with self._lock:
+            return set(self.created) - set(self.deleted)
+
+def no_setup(sandbox):
+    pass
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not met in time')
+        time.sleep(0.01)
+
+class WarmSandboxPoolTest(unittest.TestCase):
+
+    def make_pool(self, daytona, **kwargs):
+        kwargs.setdefault('setup', no_setup)
+        kwargs.setdefault('refresh_interval', 3600)
+        pool = WarmSandboxPool(daytona, **kwargs).start()
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_acquire_release_cycles_stay_within_size(self):
+        daytona = StubDaytona()
+        pool = self.make_pool(daytona, size=2)
+        wait_until(lambda: pool._idle.qsize() == 2)
+
+        for _ in range(5):
+            pool.release(pool.acquire(timeout=5))
+
+        self.assertEqual(pool._idle.qsize(), 2)
+        self.assertEqual(len(daytona.created), 2)
+        self.assertEqual(daytona.deleted, [])
+
+    def test_detach_provisions_a_replacement(self):
+        daytona = StubDaytona()
+        pool = self.make_pool(daytona, size=2)
+        wait_until(lambda: pool._idle.qsize() == 2)
+
+        kept = pool.acquire(timeout=5)
+        pool.detach(kept)
+        wait_until(lambda: pool._idle.qsize() == 2)
+
+        self.assertEqual(len(daytona.created), 3)
+        self.assertNotIn(kept.id, daytona.deleted)
+
+    def test_release_beyond_size_deletes_the_sandbox(self):
+        daytona = StubDaytona()
+        pool = self.make_pool(daytona, size=1)
+        wait_until(lambda: pool._idle.qsize() == 1)
+
+        stray = daytona.create()
+        pool.release(stray)
+
+        self.assertEqual(pool._idle.qsize(), 1)
+        self.assertIn(stray.id, daytona.deleted)
+
+    def test_failed_recycle_is_deleted_and_replaced(self):
+        daytona = StubDaytona(recycle_exit_code=1)
+        pool = self.make_pool(daytona, size=1)
+        sandbox = pool.acquire(timeout=5)
+
+        pool.release(sandbox)
+        wait_until(lambda: pool._idle.qsize() == 1)
+
+        self.assertIn(sandbox.id, daytona.deleted)
+        self.assertEqual(len(daytona.created), 2)
+
+    def test_failed_setup_is_deleted_not_pooled(self):
+        daytona = StubDaytona()
+
+        def failing_setup(sandbox):
+            raise RuntimeError('setup failed')
+
+        pool = self.make_pool(daytona, size=2, setup=failing_setup)
+        wait_until(lambda: len(daytona.deleted) == 2)
+
+        self.assertEqual(pool._idle.qsize(), 0)
+        self.assertEqual(daytona.alive(), set())
+
+    def test_shutdown_deletes_idle_and_refreshing_sandboxes(self):
+        daytona = StubDaytona(recycle_delay=0.2)
+        pool = WarmSandboxPool(daytona, setup=no_setup, size=2, refresh_interval=0.05).start()
+        wait_until(lambda: pool._idle.qsize() == 2)
+        kept = pool.acquire(timeout=5)
+
+        # Shut down while the refresher holds a sandbox outside the idle queue
+        wait_until(lambda: pool._pending > 0)
+        pool.shutdown()
+
+        self.assertEqual(daytona.alive(), {kept.id})
+
+if __name__ == '__main__':
+    unittest.main()
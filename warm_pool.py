@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import queue
+import shlex
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sandbox_setup import DEV_SERVER_PID_PATH, setup_sandbox, publish_preview
+
+REPO_DIR = '/home/daytona/agents'
+
+# Move a sandbox's checkout to the latest main without merging: a shallow fetch makes
+# the new tip a root commit, so `git pull --ff-only` can't find a merge base. node_modules
+# and the running dev server's .next are kept. When the scaffold lockfile changed,
+# reinstall and restart the dev server so node_modules isn't stale.
+RECYCLE_SCRIPT = f'''
+set -e
+cd {REPO_DIR}
+old_lock=$(git rev-parse -q --verify HEAD:scaffold-files/package-lock.json || true)
+git fetch --depth 1 origin main
+git reset --hard origin/main
+git clean -fdx -e node_modules -e .next
+new_lock=$(git rev-parse -q --verify HEAD:scaffold-files/package-lock.json || true)
+if [ "$old_lock" != "$new_lock" ]; then
+    cd scaffold-files
+    kill -- -"$(cat {DEV_SERVER_PID_PATH})" 2>/dev/null || true
+    npm ci --prefer-offline --no-audit --no-fund --legacy-peer-deps
+    setsid nohup npm run dev >>/tmp/dev.log 2>&1 </dev/null &
+    echo $! > {DEV_SERVER_PID_PATH}
+fi
+'''
+RECYCLE_COMMAND = f'bash -c {shlex.quote(RECYCLE_SCRIPT)}'
+
+class WarmSandboxPool:
+    """Pool of at most `size` sandboxes that already have the repository cloned and dependencies installed"""
+
+    def __init__(self, daytona, setup=setup_sandbox, size=2, refresh_interval=300):
+        self.daytona = daytona
+        self.setup = setup
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._idle = queue.Queue()
+        # Sandboxes being provisioned or refreshed that will land on _idle; guarded by _lock
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size)
+        self._stopped = threading.Event()
+        self._refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+
+    def start(self):
+        """Provision the pool in the background and start the periodic refresh"""
+        print(f'🔥 Warming {self.size} sandboxes...')
+        for _ in range(self.size):
+            self._replenish()
+        self._refresher.start()
+        return self
+
+    def acquire(self, timeout=None):
+        """Take a ready sandbox from the pool; hand it back with release() or detach()"""
+        return self._idle.get(timeout=timeout)
+
+    def release(self, sandbox):
+        """Reset a sandbox to a clean, up-to-date checkout and return it to the pool"""
+        if self._recycle(sandbox):
+            self._return_to_pool(sandbox, reserved=False)
+        else:
+            self._discard(sandbox)
+            self._replenish()
+
+    def detach(self, sandbox):
+        """Let the caller keep an acquired sandbox and provision a replacement for it"""
+        self._replenish()
+
+    def shutdown(self):
+        """Stop refreshing and delete every idle sandbox"""
+        with self._lock:
+            self._stopped.set()
+        # Wait for in-flight refreshes and provisions; anything they finish with after
+        # the stop flag is set gets discarded rather than put back on the idle queue
+        if self._refresher.is_alive():
+            self._refresher.join()
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def _replenish(self):
+        with self._lock:
+            if self._stopped.is_set() or self._idle.qsize() + self._pending >= self.size:
+                return
+            self._pending += 1
+        self._executor.submit(self._provision)
+
+    def _provision(self):
+        try:
+            sandbox = self.daytona.create()
+        except Exception as error:
+            print(f'❌ Failed to create warm sandbox: {str(error)}')
+            self._cancel_reservation()
+            return
+        try:
+            self.setup(sandbox)
+        except Exception as error:
+            print(f'❌ Failed to warm sandbox {sandbox.id}: {str(error)}')
+            self._cancel_reservation()
+            self._discard(sandbox)
+            return
+        print(f'✅ Warm sandbox ready: {sandbox.id}')
+        self._return_to_pool(sandbox, reserved=True)
+
+    def _recycle(self, sandbox):
+        try:
+            response = sandbox.process.exec(RECYCLE_COMMAND)
+        except Exception as error:
+            print(f'⚠️ Failed to recycle sandbox {sandbox.id}: {str(error)}')
+            return False
+        if response.exit_code != 0:
+            print(f'⚠️ Failed to recycle sandbox {sandbox.id}: {response.result}')
+            return False
+        return True
+
+    def _refresh_loop(self):
+        while not self._stopped.wait(self.refresh_interval):
+            # Cycle through the idle sandboxes one at a time so acquire() is never starved
+            for _ in range(self._idle.qsize()):
+                with self._lock:
+                    if self._stopped.is_set():
+                        break
+                    try:
+                        sandbox = self._idle.get_nowait()
+                    except queue.Empty:
+                        break
+                    # Keep its slot reserved while it's out of the idle queue
+                    self._pending += 1
+                if self._recycle(sandbox):
+                    self._return_to_pool(sandbox, reserved=True)
+                else:
+                    self._cancel_reservation()
+                    self._discard(sandbox)
+                    self._replenish()
+
+    def _cancel_reservation(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _return_to_pool(self, sandbox, reserved):
+        with self._lock:
+            if reserved:
+                self._pending -= 1
+            fits = reserved or self._idle.qsize() + self._pending < self.size
+            if fits and not self._stopped.is_set():
+                self._idle.put(sandbox)
+                return
+        self._discard(sandbox)
+
+    def _discard(self, sandbox):
+        try:
+            self.daytona.delete(sandbox)
+        except Exception as error:
+            print(f'⚠️ Failed to delete sandbox {sandbox.id}: {str(error)}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep Daytona scaffold sandboxes warm and hand them out on demand')
+    parser.add_argument('api_key', nargs='?', default=os.getenv('DAYTONA_API_KEY'))
+    parser.add_argument('--size', type=int, default=2, help='number of warm sandboxes to keep ready')
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print('❌ DAYTONA_API_KEY environment variable or command line argument required')
+        print('Usage: python warm_pool.py [api_key] [--size N]')
+        sys.exit(1)
+
+    # Imported here so the pool module itself doesn't depend on the SDK
+    from daytona_env import get_daytona
+
+    with WarmSandboxPool(get_daytona(args.api_key), size=args.size) as pool:
+        try:
+            while True:
+                input('\n⏎ Press Enter for a preview sandbox (Ctrl-C to stop and delete idle sandboxes)...')
+                print('♨️ Acquiring warm sandbox from pool...')
+                sandbox = pool.acquire()
+                print(f'📋 Sandbox ID: {sandbox.id}')
+                # The sandbox now belongs to the user; warm a replacement in its place
+                pool.detach(sandbox)
+                publish_preview(sandbox)
+        except (KeyboardInterrupt, EOFError):
+            print('\n🧹 Shutting down pool...')
+
+if __name__ == '__main__':
+    main()